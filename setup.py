@@ -74,7 +74,7 @@ setup(
         "reuse==5.0.2",
         "requests==2.32.3",
         "semver==3.0.2",
-        "toml==0.10.2",
+        "tomli==2.2.1; python_version < '3.11'",
     ],
     extras_require={
         "doc": [
@@ -26,20 +26,30 @@ Module for running `REUSE <https://reuse.software/>`_ to add missing license hea
 A license header consists of the Ansys copyright statement and licensing information.
 """
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
 from datetime import date as dt
 import filecmp
+from functools import lru_cache
+import hashlib
+import io
+import json
+import multiprocessing
+import os
 from pathlib import Path
 import re
 import shutil
 import sys
-from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Optional
 
-import git
-from jinja2 import Environment, FileSystemLoader
-from reuse import extract
-from reuse.cli import common
-from reuse.cli.annotate import add_header_to_file, get_comment_style, get_reuse_info, get_template
+if TYPE_CHECKING:  # pragma: no cover
+    from reuse import ReuseInfo
+    from reuse.project import Project
 
+HOOK_PATH = Path(__file__).parent.resolve()
+"""Location of the pre-commit hook on your system."""
+ASSETS_PATH = HOOK_PATH / "assets"
+"""Location of the hook's assets folder containing the default template and license."""
 DEFAULT_TEMPLATE = "ansys"
 """Default template to use for license headers."""
 DEFAULT_COPYRIGHT = "ANSYS, Inc. and/or its affiliates."
@@ -50,6 +60,21 @@ DEFAULT_START_YEAR = dt.today().year
 """Default start year for license headers."""
 YEAR_REGEX = r"(\d{4}) - (\d{4})|\d{4}"
 """Year regex to match year or year range in files."""
+REUSE_INFO_REGEX = re.compile(r"SPDX-License-Identifier:|SPDX-FileContributor:|Copyright|©")
+"""Regex matching the markers that every line containing REUSE information has."""
+IGNORED_REUSE_DIRS = {".git", ".hg", ".sl", ".reuse", "LICENSES"}
+"""Directories whose files are not covered by REUSE."""
+MIN_PARALLEL_FILES = 8
+"""Minimum number of committed files to check them in parallel processes."""
+WINDOWS_MAX_WORKERS = 61
+"""Maximum number of worker processes that Python supports on Windows."""
+FILES_ENV_VARIABLE = "ANSYS_LICENSE_HEADERS_FILES"
+"""Environment variable listing the files to check, one per line."""
+CACHE_FILE = "ansys_license_cache.json"
+"""Name of the file in the git directory that caches files with up to date headers."""
+
+# Variables from set_variables() used by the worker processes of parallel_file_check()
+_worker_variables = ()
 
 
 def set_lint_args(parser: argparse.ArgumentParser) -> argparse.Namespace:
@@ -100,6 +125,23 @@ def set_lint_args(parser: argparse.ArgumentParser) -> argparse.Namespace:
     parser.add_argument("--ignore_license_check", action="store_true")
     parser.add_argument("--parser")
     parser.add_argument("--no_multiprocessing", action="store_true")
+    # Check all files, even if their headers were up to date the last time the hook ran
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Check all files instead of skipping files cached as up to date.",
+    )
+    # Get the number of processes used to check files. By default, one per CPU
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        help=(
+            "Number of processes used to check files. By default, one per CPU. "
+            f"Fewer than {MIN_PARALLEL_FILES} files are always checked in a single process. "
+            f"On Windows, at most {WINDOWS_MAX_WORKERS} processes are used."
+        ),
+        default=None,
+    )
 
     # Option for printing lint output
     mutex_group = parser.add_mutually_exclusive_group()
@@ -108,6 +150,31 @@ def set_lint_args(parser: argparse.ArgumentParser) -> argparse.Namespace:
     return parser.parse_args()
 
 
+def positive_int(value: str) -> int:
+    """
+    Convert an argument to an integer greater than or equal to one.
+
+    Parameters
+    ----------
+    value: str
+        Value of the argument.
+
+    Returns
+    -------
+    int
+        Value of the argument as an integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not an integer greater than or equal to 1")
+
+    return number
+
+
 def get_full_paths(file_list: list) -> list:
     """
     Update file paths to be absolute paths with system separators.
@@ -122,11 +189,99 @@ def get_full_paths(file_list: list) -> list:
     list
         List containing the full paths of committed files.
     """
-    full_path_files = []
-    for file in file_list:
-        full_path_files.append(Path(file).resolve())
+    # abspath normalizes the separators without resolving symbolic links on disk
+    return [os.path.abspath(file) for file in file_list]
 
-    return full_path_files
+
+def get_git_dirs(path: str) -> tuple:
+    """
+    Get the root directory and the git directory of the repository containing a path.
+
+    Searching the parent directories for ``.git`` avoids importing GitPython and
+    starting a git process when no files need to be checked.
+
+    Parameters
+    ----------
+    path: str
+        Path inside the git repository.
+
+    Returns
+    -------
+    str
+        Full path of the repository's root directory.
+    str
+        Full path of the repository's git directory.
+    """
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return path, dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules have a .git file containing the path to the git directory
+            with open(dot_git, encoding="utf-8") as git_file:
+                git_dir = git_file.read().strip().removeprefix("gitdir:").strip()
+            return path, os.path.normpath(os.path.join(path, git_dir))
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise Exception("Please run the hook inside a git repository.")
+        path = parent
+
+
+def get_committed_files(file_list: list, git_root: str) -> list:
+    """
+    Get the full paths of the committed files, ignoring entries that are not files.
+
+    If the ``ANSYS_LICENSE_HEADERS_FILES`` environment variable is set, only the files it
+    lists, one per line, are kept from the files passed to the hook. Entries that do not
+    exist are ignored, and directories are replaced by the files staged inside them.
+
+    Parameters
+    ----------
+    file_list: list
+        List containing committed files.
+    git_root: str
+        Full path of the repository's root directory.
+
+    Returns
+    -------
+    list
+        List containing the full paths of committed files.
+    """
+    # Remove duplicate files, so they are not checked twice or by two workers at once
+    full_path_files = list(dict.fromkeys(get_full_paths(file_list)))
+
+    # Only keep the files listed in the environment variable. The files passed by
+    # pre-commit already match the hook's "files" pattern, so they are not replaced
+    env_files = os.environ.get(FILES_ENV_VARIABLE)
+    if env_files:
+        listed_files = set(get_full_paths([file for file in env_files.splitlines() if file]))
+        full_path_files = [file for file in full_path_files if file in listed_files]
+
+    files = [file for file in full_path_files if os.path.isfile(file)]
+    directories = [file for file in full_path_files if os.path.isdir(file)]
+
+    # Pre-commit passes staged files, so only ask git when an entry is a directory
+    if not directories:
+        return files
+
+    import git
+
+    # Get the files added, copied, modified, or renamed in the index
+    staged_output = git.Git(git_root).diff("--cached", "--name-only", "--diff-filter=ACMR", "-z")
+    staged_files = get_full_paths(
+        [os.path.join(git_root, file) for file in staged_output.split("\0") if file]
+    )
+
+    # Add the staged files inside the directories
+    for file in staged_files:
+        if file not in files and any(
+            file.startswith(os.path.join(directory, "")) for directory in directories
+        ):
+            files.append(file)
+
+    return files
 
 
 def update_license_file(arg_dict: dict) -> int:
@@ -137,16 +292,15 @@ def update_license_file(arg_dict: dict) -> int:
     ----------
     arg_dict: dict
         Dictionary containing the committed files, custom copyright, template, license,
-        changed_headers, start & end year, and git_repo
+        changed_headers, start & end year, git_root, and git_dir
     """
     # Get location of LICENSE file in the repository the hook runs on
-    git_root = arg_dict["git_repo"].git.rev_parse("--show-toplevel")
-    repo_license_loc = Path(git_root) / "LICENSE"
-    save_repo_license = Path(shutil.copyfile(repo_license_loc, f"{repo_license_loc}_save"))
+    repo_license_loc = Path(arg_dict["git_root"]) / "LICENSE"
+    # Keep the content of LICENSE in memory rather than copying it to a temporary file
+    before_license = repo_license_loc.read_bytes()
 
     # Get the location of MIT.txt in the hook's assets folder
-    hook_loc = Path(__file__).parent.resolve()
-    hook_license_file = hook_loc / "assets" / "LICENSES" / f"{DEFAULT_LICENSE}.txt"
+    hook_license_file = ASSETS_PATH / "LICENSES" / f"{DEFAULT_LICENSE}.txt"
 
     # Copy MIT.txt from the assets folder to the LICENSE file in the repository
     if repo_license_loc.is_file() and (arg_dict["license"] == DEFAULT_LICENSE):
@@ -166,17 +320,14 @@ def update_license_file(arg_dict: dict) -> int:
         )
 
     # If the year changed, print a message that the LICENSE file was changed
-    if not check_same_content(save_repo_license, repo_license_loc):
+    if repo_license_loc.read_bytes() != before_license:
         changed = 1
         print(f"Successfully updated year in {repo_license_loc}")
 
-    # Remove the temporary file
-    save_repo_license.unlink()
-
     return changed
 
 
-def link_assets(assets: dict, git_root: str, args: argparse.Namespace) -> None:
+def link_assets(assets: dict, git_root: str, args: argparse.Namespace, current_year: int) -> None:
     """
     Link the default template and/or license from the assets folder to your git repo.
 
@@ -188,53 +339,87 @@ def link_assets(assets: dict, git_root: str, args: argparse.Namespace) -> None:
         Full path of the repository's root directory.
     args: argparse.Namespace
         Namespace of arguments with their values.
+    current_year: int
+        The current year to write in the default license.
     """
+    # Whether the default template and/or license are used
+    use_default_template = args.custom_template == DEFAULT_TEMPLATE
+    use_default_license = args.custom_license == DEFAULT_LICENSE and not args.ignore_license_check
+
+    # Nothing to link if the custom template and license are used
+    if not (use_default_template or use_default_license):
+        return
+
     # Unlink default files & remove .reuse and LICENSES folders if empty
     cleanup(assets, git_root)
 
-    # Get the location of the hook in the file system
-    hook_loc = Path(__file__).parent.resolve()
-
     for key, value in assets.items():
-        # Get the location of the hook's "assets" folder
-        hook_asset_dir = Path(hook_loc) / "assets" / value["path"]
+        # Get the location of the asset in the hook's "assets" folder
+        hook_asset_dir = ASSETS_PATH / value["path"]
         repo_asset_dir = Path(git_root) / value["path"]
 
         # If key is .reuse and the custom template is being used
-        if key == ".reuse" and args.custom_template == DEFAULT_TEMPLATE:
+        if key == ".reuse" and use_default_template:
             mkdirs_and_link(value["path"], hook_asset_dir, repo_asset_dir, value["default_file"])
 
         # If key is LICENSES, the default license is being used, and ignore_license_check is False
-        if (
-            key == "LICENSES"
-            and args.custom_license == DEFAULT_LICENSE
-            and not args.ignore_license_check
-        ):
-            hook_license_file = hook_loc / "assets" / "LICENSES" / f"{DEFAULT_LICENSE}.txt"
+        if key == "LICENSES" and use_default_license:
             repo_license_file = repo_asset_dir / value["default_file"]
             if not repo_asset_dir.is_dir():
                 repo_asset_dir.mkdir(parents=True)
-            generate_license_file(hook_license_file.parent, dt.today().year, repo_license_file)
+            generate_license_file(hook_asset_dir, current_year, repo_license_file)
 
 
-def generate_license_file(template_parent_dir, current_year, license_file_name) -> None:
-    """Generate the MIT.txt file from the assets/LICENSES/MIT.txt template.
+@lru_cache(maxsize=8)
+def render_license_template(template_parent_dir: Path, current_year: int) -> str:
+    """Render the assets/LICENSES/MIT.txt template for a year.
+
+    The rendered content is cached, so the template is only loaded and rendered once
+    per year.
 
     Parameters
     ----------
-    template_parent_dir: str
+    template_parent_dir: Path
         Path to the parent directory of the template file.
     current_year: int
         The current year.
-    license_file_name: str
-        Path to the license file in the repository to generate.
+
+    Returns
+    -------
+    str
+        Content of the license file.
     """
+    from jinja2 import Environment, FileSystemLoader
+
     loader = FileSystemLoader(searchpath=template_parent_dir)
     env = Environment(loader=loader)  # nosec
     # Get the template for the specified file
     template = env.get_template(f"{DEFAULT_LICENSE}.txt")
     # Generate the file content from the template
-    file_content = template.render(current_year=current_year)
+    return template.render(current_year=current_year)
+
+
+def generate_license_file(
+    template_parent_dir: Path, current_year: int, license_file_name: Path
+) -> None:
+    """Generate the MIT.txt file from the assets/LICENSES/MIT.txt template.
+
+    Parameters
+    ----------
+    template_parent_dir: Path
+        Path to the parent directory of the template file.
+    current_year: int
+        The current year.
+    license_file_name: Path
+        Path to the license file in the repository to generate.
+    """
+    file_content = render_license_template(template_parent_dir, current_year)
+
+    # Skip writing the file if it already has the generated content. The template only
+    # contains the current year, so this only happens for the LICENSE file when the
+    # start year is the current year. Otherwise, update_year_range rewrites the year span
+    if license_file_name.is_file() and license_file_name.read_text() == file_content:
+        return
 
     # Write the file content to the LICENSE file in the repository
     with license_file_name.open("w") as file:
@@ -263,78 +448,151 @@ def mkdirs_and_link(
     # If .reuse/templates or LICENSES directories do not exist, create them
     if not Path(asset_dir).is_dir():
         Path(asset_dir).mkdir(parents=True)
-    # Make symbolic links to files within the assets folder
-    dest.symlink_to(src)
+    # Make symbolic links to files within the assets folder. Creating symbolic
+    # links requires privileges on Windows, so fall back to a hard link
+    try:
+        dest.symlink_to(src)
+    except OSError:
+        os.link(src, dest)
 
 
-def recursive_file_check(
-    changed_headers: int, obj: common.ClickObj, values: dict, args: argparse.Namespace, count: int
-) -> int:
-    """Check if the committed file is missing its header.
+def get_project(git_root: str) -> "Project":
+    """
+    Get the `REUSE <https://reuse.software/>`_ project of the repository.
+
+    ``Project.from_directory`` walks every file in the repository to find the REUSE.toml
+    files. Git lists them instead, so building the project does not slow down as the
+    repository grows. The project's licenses are not loaded because the hook does not lint.
+
+    Parameters
+    ----------
+    git_root: str
+        Full path of the repository's root directory.
+
+    Returns
+    -------
+    Project
+        The REUSE project of the repository.
+    """
+    import git
+    from reuse.exceptions import GlobalLicensingConflictError, GlobalLicensingParseError
+    from reuse.global_licensing import NestedReuseTOML, ReuseTOML
+    from reuse.project import Project
+    from reuse.vcs import VCSStrategyGit
+
+    root = Path(git_root)
+
+    try:
+        # Let REUSE find the deprecated .reuse/dep5 file and skip Meson subprojects
+        if (root / ".reuse" / "dep5").exists() or (root / "meson.build").exists():
+            return Project.from_directory(root)
+
+        # Get the tracked and untracked REUSE.toml files that are not ignored
+        toml_output = git.Git(git_root).ls_files(
+            "--cached", "--others", "--exclude-standard", "-z", "--", "REUSE.toml", "*/REUSE.toml"
+        )
+        reuse_tomls = [
+            ReuseTOML.from_file(root / file)
+            for file in toml_output.split("\0")
+            if file and is_reuse_toml_covered(root / file, root)
+        ]
+        global_licensing = (
+            NestedReuseTOML(reuse_tomls=reuse_tomls, source=str(root)) if reuse_tomls else None
+        )
+    except GlobalLicensingParseError as error:
+        raise Exception(
+            f"'{error.source}' could not be parsed. We received the following error message: "
+            f"{error}"
+        ) from error
+    except (GlobalLicensingConflictError, OSError) as error:
+        raise Exception(str(error)) from error
+
+    return Project(root, vcs_strategy=VCSStrategyGit(root), global_licensing=global_licensing)
+
+
+def is_reuse_toml_covered(reuse_toml: Path, root: Path) -> bool:
+    """
+    Check if `REUSE <https://reuse.software/>`_ reads a REUSE.toml file listed by git.
+
+    Like REUSE, empty files, symbolic links, and files in the .git, .hg, .sl,
+    .reuse, and LICENSES directories are skipped.
+
+    Parameters
+    ----------
+    reuse_toml: Path
+        Full path of the REUSE.toml file.
+    root: Path
+        Full path of the repository's root directory.
+
+    Returns
+    -------
+    bool
+        ``True`` if REUSE reads the REUSE.toml file.
+        ``False`` if REUSE skips the REUSE.toml file.
+    """
+    if reuse_toml.is_symlink() or not reuse_toml.is_file() or reuse_toml.stat().st_size == 0:
+        return False
+
+    return not IGNORED_REUSE_DIRS.intersection(reuse_toml.relative_to(root).parts[:-1])
+
+
+def non_recursive_file_check(
+    changed_headers: int, project: "Project", values: dict, args: argparse.Namespace
+) -> tuple:
+    """
+    Check if the committed file is missing its header.
 
     Parameters
     ----------
     changed_headers: int
         ``0`` if no headers were added or updated.
         ``1`` if headers were added or updated.
-    obj: common.ClickObj
-        A click object used in `REUSE <https://reuse.software/>`_ to annotate files.
+    project: Project
+        The `REUSE <https://reuse.software/>`_ project of the repository.
     values: dict
         Dictionary containing the values of files, copyright,
-        template, license, changed_headers, year, and git_repo.
+        template, license, changed_headers, year, git_root, and git_dir.
     args: argparse.Namespace
         Namespace of arguments with their values.
-    count: int
-        Integer of the location in the files array.
 
     Returns
     -------
     int
         ``0`` if all files contain headers and are up to date.
         ``1`` if ``REUSE`` changed all noncompliant files.
+    list
+        List containing ``0`` for each file whose header was up to date and ``1``
+        for each file whose header was added or updated.
     """
     project, template, commented, license, pre_commit_files, copyright, years = set_variables(
-        obj, values, args
+        project, values, args
     )
 
-    if count < len(pre_commit_files):
-        # Get the file name at count from pre_commit_files
-        file = pre_commit_files[count]
-        # Get the reuse information of the file
-        file_reuse_info = project.reuse_info_of(file)
-
-        if (not file_reuse_info) or (Path(file).stat().st_size == 0):
-            changed_headers = 1
-            # Add the header to the file
-            add_header(copyright, license, years, file, template, commented)
-            # Check if the next file is in missing_headers
-            return recursive_file_check(changed_headers, obj, values, args, count + 1)
-        elif file_reuse_info:
-            # Update the header
-            changed_headers = update_header(
-                changed_headers, file, copyright, license, years, template, commented
-            )
-            return recursive_file_check(changed_headers, obj, values, args, count + 1)
+    file_results = []
+    for file in pre_commit_files:
+        file_results.append(
+            check_file(file, project, template, commented, license, copyright, years)
+        )
 
-    return changed_headers
+    return max([changed_headers, *file_results]), file_results
 
 
-def non_recursive_file_check(
-    changed_headers: int, obj: common.ClickObj, values: dict, args: argparse.Namespace
-) -> int:
+def parallel_file_check(
+    changed_headers: int, project: "Project", values: dict, args: argparse.Namespace
+) -> tuple:
     """
-    Check if the committed file is missing its header.
+    Check if the committed files are missing their headers, using one process per CPU.
 
     Parameters
     ----------
     changed_headers: int
         ``0`` if no headers were added or updated.
         ``1`` if headers were added or updated.
-    obj: common.ClickObj
-        A click object used in `REUSE <https://reuse.software/>`_ to annotate files.
+    project: Project
+        The `REUSE <https://reuse.software/>`_ project of the repository.
     values: dict
         Dictionary containing the values of files, copyright,
-        template, license, changed_headers, year, and git_repo.
+        template, license, changed_headers, year, git_root, and git_dir.
     args: argparse.Namespace
         Namespace of arguments with their values.
 
@@ -343,37 +601,162 @@ def non_recursive_file_check(
     int
         ``0`` if all files contain headers and are up to date.
         ``1`` if ``REUSE`` changed all noncompliant files.
+    list
+        List containing ``0`` for each file whose header was up to date and ``1``
+        for each file whose header was added or updated.
     """
-    project, template, commented, license, pre_commit_files, copyright, years = set_variables(
-        obj, values, args
-    )
+    files = values["files"]
+    max_workers = min(get_max_workers(args.jobs), len(files))
+
+    # Fork the workers on Linux, so they inherit the project instead of unpickling it.
+    # Other platforms keep their default start method, because fork is unsafe on macOS
+    mp_context = multiprocessing.get_context("fork") if sys.platform == "linux" else None
+
+    # Flush the output, so forked workers do not print it again
+    sys.stdout.flush()
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=init_file_check_worker,
+        initargs=(project, values, args),
+    ) as executor:
+        results = executor.map(
+            parallel_check_file, files, chunksize=max(1, len(files) // (max_workers * 4))
+        )
+        # Print the output of the workers in file order, so their messages do not interleave
+        file_results = []
+        for file_changed, output in results:
+            print(output, end="")
+            file_results.append(file_changed)
 
-    for file in pre_commit_files:
-        # Get the reuse information of the file
-        file_reuse_info = project.reuse_info_of(file)
-
-        # If the file is empty or does not contain reuse information
-        if (not file_reuse_info) or (Path(file).stat().st_size == 0):
-            changed_headers = 1
-            add_header(copyright, license, years, file, template, commented)
-        elif file_reuse_info:
-            changed_headers = update_header(
-                changed_headers, file, copyright, license, years, template, commented
-            )
+    return max([changed_headers, *file_results]), file_results
 
-    return changed_headers
 
+def get_max_workers(jobs: Optional[int]) -> int:
+    """
+    Get the number of processes used to check files.
+
+    Parameters
+    ----------
+    jobs: int, optional
+        Number of processes from the ``--jobs`` argument. If ``None``, one per CPU.
+
+    Returns
+    -------
+    int
+        Number of processes used to check files.
+    """
+    max_workers = jobs or os.cpu_count() or 1
+
+    # ProcessPoolExecutor raises a ValueError for more workers than Windows supports
+    if sys.platform == "win32":
+        max_workers = min(max_workers, WINDOWS_MAX_WORKERS)
+
+    return max_workers
+
+
+def init_file_check_worker(project: "Project", values: dict, args: argparse.Namespace) -> None:
+    """
+    Set the variables used to check files in a worker process.
+
+    Parameters
+    ----------
+    project: Project
+        The `REUSE <https://reuse.software/>`_ project of the repository.
+    values: dict
+        Dictionary containing the values of files, copyright,
+        template, license, changed_headers, and year.
+    args: argparse.Namespace
+        Namespace of arguments with their values.
+    """
+    global _worker_variables
+    _worker_variables = set_variables(project, values, args)
+
+
+def parallel_check_file(file: str) -> tuple:
+    """
+    Add or update the header of a committed file in a worker process.
 
-def set_variables(obj: common.ClickObj, values: dict, args: argparse.Namespace) -> tuple:
+    Parameters
+    ----------
+    file: str
+        The file whose header is being added or updated.
+
+    Returns
+    -------
+    int
+        ``0`` if the file header is up to date.
+        ``1`` if the file header was added or updated.
+    str
+        Output printed while checking the file.
+    """
+    project, template, commented, license, _, copyright, years = _worker_variables
+
+    # Capture the output, so the parent process prints it instead of all workers at once
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        file_changed = check_file(file, project, template, commented, license, copyright, years)
+
+    return file_changed, output.getvalue()
+
+
+def check_file(
+    file: str,
+    project: "Project",
+    template: str,
+    commented: bool,
+    license: str,
+    copyright: str,
+    years: str,
+) -> int:
+    """
+    Add the header to the file if it is missing, or update the existing header.
+
+    Parameters
+    ----------
+    file: str
+        The file whose header is being added or updated.
+    project: reuse.project.Project
+        The `REUSE <https://reuse.software/>`_ project of the git repository.
+    template: str
+        The template to use for the header. For example, "ansys" for "ansys.jinja2".
+    commented: bool
+        Whether the template is commented or not.
+    license: str
+        The license of the header. For example, "MIT".
+    copyright: str
+        The copyright string of the header. For example, "ANSYS, Inc. and/or its affiliates."
+    years: str
+        The year span of the header. For example, "2024" or "2023 - 2024".
+
+    Returns
+    -------
+    int
+        ``0`` if the file header is up to date.
+        ``1`` if the file header was added or updated.
+    """
+    # Get the reuse information of the file
+    file_reuse_info = project.reuse_info_of(file)
+
+    # If the file is empty or does not contain reuse information, add the header
+    if (not file_reuse_info) or (os.stat(file).st_size == 0):
+        add_header(copyright, license, years, file, template, commented)
+        return 1
+
+    # Update the header
+    return update_header(0, file, copyright, license, years, template, commented)
+
+
+def set_variables(project: "Project", values: dict, args: argparse.Namespace) -> tuple:
     """Set variables to run `REUSE <https://reuse.software/>`_ on the project.
 
     Parameters
     ----------
-    obj: common.ClickObj
-        A click object used in `REUSE <https://reuse.software/>`_ to annotate files.
+    project: Project
+        The `REUSE <https://reuse.software/>`_ project of the repository.
     values: dict
         Dictionary containing the values of files, copyright,
-        template, license, changed_headers, year, and git_repo.
+        template, license, changed_headers, year, git_root, and git_dir.
     args: argparse.Namespace
         Namespace of arguments with their values.
 
@@ -382,7 +765,8 @@ def set_variables(obj: common.ClickObj, values: dict, args: argparse.Namespace)
     tuple
         Tuple containing the project, template, commented, license, files, copyright, and years.
     """
-    project = obj.project
+    from reuse.cli.annotate import get_template
+
     template, commented = get_template(values["template"], project)
 
     license = [] if args.ignore_license_check else [values["license"]]
@@ -436,19 +820,16 @@ def update_header(
     # This prevents SPDX-License-Identifier from being added twice
     license = []
 
-    # Save current copy of file
-    before_hook = NamedTemporaryFile(mode="w", delete=False).name
-    shutil.copyfile(file, before_hook)
+    # Save current content of file in memory
+    before_hook = Path(file).read_bytes()
 
     # Update the header
-    # tmp captures the stdout of the header.run() function
-    with NamedTemporaryFile(mode="w", delete=True) as tmp:
-        add_header(copyright, license, years, file, template, commented)
+    add_header(copyright, license, years, file, template, commented)
 
     # Check if the file before add-license-headers was run is the same as the one
     # after add-license-headers was run. If not, apply the syntax changes
     # from other hooks before add-license-headers was run to the file
-    if check_same_content(before_hook, file) == False:
+    if Path(file).read_bytes() != before_hook:
         apply_hook_changes(before_hook, file)
 
     years_list = years.split(" - ")
@@ -464,12 +845,10 @@ def update_header(
     # Check if the file content before add-license-headers was run has been changed
     # Assuming the syntax was fixed in the above if statement, this check is
     # solely for the file's content
-    if check_same_content(before_hook, file) == False:
+    if Path(file).read_bytes() != before_hook:
         changed_headers = 1
         print(f"Successfully changed header of {file}")
 
-    Path(before_hook).unlink()
-
     return changed_headers
 
 
@@ -494,19 +873,12 @@ def add_header(
     commented: bool
         Whether the template is commented or not.
     """
-    # Get the REUSE information from the file.
-    reuse_info = get_reuse_info(
-        copyrights=copyright,
-        licenses=license,
-        copyright_prefix="string-c",
-        year=years,
-        contributors="",
-    )
+    from reuse.cli.annotate import add_header_to_file, get_comment_style
 
     # Add or update the header in the file with the REUSE information.
     add_header_to_file(
         path=file,
-        reuse_info=reuse_info,
+        reuse_info=get_header_reuse_info(tuple(copyright), tuple(license), years),
         template=template,
         template_is_commented=commented,
         style=f"{get_comment_style(file).SHORTHAND}",
@@ -515,6 +887,39 @@ def add_header(
     )
 
 
+@lru_cache(maxsize=8)
+def get_header_reuse_info(copyright: tuple, license: tuple, years: str) -> "ReuseInfo":
+    """Get the REUSE information to add to the license headers.
+
+    The REUSE information only depends on the hook arguments, so it is created
+    once per run and shared by all files.
+
+    Parameters
+    ----------
+    copyright: tuple
+        The copyright lines for the license header. For example,
+        ("ANSYS, Inc. and/or its affiliates.",).
+    license: tuple
+        The licenses for the license header. For example, ("MIT",).
+    years: str
+        The year span in the license header. For example, "2024" or "2023 - 2024".
+
+    Returns
+    -------
+    ReuseInfo
+        The REUSE information for the license header.
+    """
+    from reuse.cli.annotate import get_reuse_info
+
+    return get_reuse_info(
+        copyrights=copyright,
+        licenses=license,
+        copyright_prefix="string-c",
+        year=years,
+        contributors="",
+    )
+
+
 def check_same_content(before_hook: str, after_hook: str) -> bool:
     """
     Check if file before the hook ran is the same as after the hook ran.
@@ -541,52 +946,51 @@ def check_same_content(before_hook: str, after_hook: str) -> bool:
         return True
 
 
-def apply_hook_changes(before_hook: str, after_hook: str) -> None:
+def apply_hook_changes(before_hook: bytes, after_hook: str) -> None:
     """
     Add earlier hook changes to updated file with header.
 
     Parameters
     ----------
-    before_hook: str
-        Path to file before add-license-headers was run.
+    before_hook: bytes
+        Content of the file before add-license-headers was run.
     after_hook: str
         Path to file after add-license-headers was run.
     """
-    count = 0
-    found_reuse_info = False
+    from reuse import extract
 
-    before_hook_lines = get_content(before_hook)
+    # Split the lines the same way as reading the file with newline=""
+    before_hook_lines = io.StringIO(before_hook.decode("utf-8"), newline="").readlines()
     after_hook_lines = get_content(after_hook)
 
-    with Path(after_hook).open(encoding="utf-8", newline="", mode="w") as file:
-        # Copy file content before add-license-header was run into
-        # the file after add-license-header was run.
-        for line in after_hook_lines:
-            # Copy the new reuse lines into the file
-            if extract.contains_reuse_info(line):
-                count += 1
-                found_reuse_info = True
-                file.write(line)
-            else:
-                if found_reuse_info:
-                    try:
-                        # Check the lines after the reuse info are the same
-                        # If not, print the line after the reuse info
-                        # This happens when a comment changes from one line to
-                        # multiline
-                        if line != before_hook_lines[count]:
-                            file.write(line)
-                    except IndexError:
-                        pass
-
-                    # Copy the rest of the file after the reuse information
-                    for line_after_reuse_info in before_hook_lines[count:]:
-                        file.write(line_after_reuse_info)
-                    break
-                # Copy the header lines before reuse information is found
-                else:
-                    count += 1
-                    file.write(line)
+    # Find the index of the first line after the reuse information. If the file
+    # has no reuse information, or it runs to the end of the file, keep the whole file
+    reuse_info_end = len(after_hook_lines)
+    found_reuse_info = False
+    for index, line in enumerate(after_hook_lines):
+        # Lines without any of the REUSE markers are skipped before running
+        # the full REUSE parser
+        if REUSE_INFO_REGEX.search(line) and extract.contains_reuse_info(line):
+            found_reuse_info = True
+        elif found_reuse_info:
+            reuse_info_end = index
+            break
+
+    # Copy the header lines and the new reuse lines into the file
+    content = after_hook_lines[:reuse_info_end]
+    if reuse_info_end < len(after_hook_lines):
+        # Check the line after the reuse info is the same. If not, keep the line
+        # after the reuse info. This happens when a comment changes from one line
+        # to multiline
+        line = after_hook_lines[reuse_info_end]
+        if reuse_info_end < len(before_hook_lines) and line != before_hook_lines[reuse_info_end]:
+            content.append(line)
+
+        # Copy the rest of the file content before add-license-header was run
+        content.extend(before_hook_lines[reuse_info_end:])
+
+    with open(after_hook, encoding="utf-8", newline="", mode="w") as file:
+        file.writelines(content)
 
 
 def get_content(file: str) -> str:
@@ -602,8 +1006,8 @@ def get_content(file: str) -> str:
     str
         Content of the file.
     """
-    read_file = Path(file).open(encoding="utf-8", newline="", mode="r")
-    content = read_file.readlines()
+    with open(file, encoding="utf-8", newline="", mode="r") as read_file:
+        content = read_file.readlines()
 
     return content
 
@@ -634,7 +1038,7 @@ def update_year_range(
         ``1`` if the year was updated.
     """
     # Open the file and read its content
-    with Path(file).open(encoding="utf-8", newline="", mode="r") as read_file:
+    with open(file, encoding="utf-8", newline="", mode="r") as read_file:
         lines = read_file.readlines()
         content = "".join(lines)
 
@@ -660,7 +1064,7 @@ def update_year_range(
         content = re.sub(year_regex, user_year_span, content)
 
         # Update the file with the new year span
-        with Path(file).open(encoding="utf-8", newline="", mode="w") as write_file:
+        with open(file, encoding="utf-8", newline="", mode="w") as write_file:
             write_file.write(content)
 
     return changed_headers
@@ -714,6 +1118,124 @@ def cleanup(assets: dict, os_git_root: str) -> None:
                 shutil.rmtree(key)
 
 
+def get_cache_settings(values: dict, args: argparse.Namespace, git_root: str) -> str:
+    """
+    Get a digest of the settings that determine the content of the license headers.
+
+    Parameters
+    ----------
+    values: dict
+        Dictionary containing the values of files, copyright,
+        template, license, changed_headers, year, git_root, and git_dir.
+    args: argparse.Namespace
+        Namespace of arguments with their values.
+    git_root: str
+        Full path of the repository's root directory.
+
+    Returns
+    -------
+    str
+        Digest of the hook version, header arguments, and template file.
+    """
+    from ansys.pre_commit_hooks import __version__
+
+    settings = [
+        __version__,
+        values["copyright"],
+        values["template"],
+        values["license"],
+        str(values["start_year"]),
+        str(values["current_year"]),
+        str(args.ignore_license_check),
+    ]
+
+    # Include the modification time of the template, so changing it updates the headers.
+    # The default template is only linked into the repository later, so use the hook's copy
+    if values["template"] == DEFAULT_TEMPLATE:
+        template_dir = ASSETS_PATH / ".reuse" / "templates"
+    else:
+        template_dir = Path(git_root) / ".reuse" / "templates"
+    for name in (
+        values["template"],
+        f"{values['template']}.jinja2",
+        f"{values['template']}.commented.jinja2",
+    ):
+        template_file = template_dir / name
+        if template_file.is_file():
+            settings.append(f"{name}:{os.stat(template_file).st_mtime_ns}")
+
+    return hashlib.blake2b("\n".join(settings).encode()).hexdigest()
+
+
+def get_file_signature(file: str) -> list:
+    """
+    Get the modification time and size of a file.
+
+    Parameters
+    ----------
+    file: str
+        Path to the file.
+
+    Returns
+    -------
+    list
+        List containing the modification time in nanoseconds and size of the file.
+    """
+    stat = os.stat(file)
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_cache(git_dir: str, settings: str) -> dict:
+    """
+    Load the files whose headers were up to date the last time the hook ran.
+
+    Parameters
+    ----------
+    git_dir: str
+        Path to the .git directory of the repository.
+    settings: str
+        Digest of the current settings from ``get_cache_settings``.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping file paths to their signature from ``get_file_signature``.
+        The dictionary is empty if the cache does not exist or used different settings.
+    """
+    try:
+        with open(os.path.join(git_dir, CACHE_FILE), encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get("settings") != settings:
+        return {}
+
+    return cache.get("files", {})
+
+
+def save_cache(git_dir: str, settings: str, files: dict) -> None:
+    """
+    Save the files whose headers are up to date.
+
+    Parameters
+    ----------
+    git_dir: str
+        Path to the .git directory of the repository.
+    settings: str
+        Digest of the current settings from ``get_cache_settings``.
+    files: dict
+        Dictionary mapping file paths to their signature from ``get_file_signature``.
+    """
+    try:
+        with open(os.path.join(git_dir, CACHE_FILE), "w", encoding="utf-8") as cache_file:
+            json.dump({"settings": settings, "files": files}, cache_file)
+    except OSError:
+        # The cache only speeds up the next run, so do not fail the hook
+        pass
+
+
 def main():
     """
     Add and update file headers with `REUSE <https://reuse.software/>`_.
@@ -729,16 +1251,19 @@ def main():
     parser = argparse.ArgumentParser()
     args = set_lint_args(parser)
 
-    # Get root directory of the git repository.
-    git_repo = git.Repo(Path.cwd(), search_parent_directories=True)
+    # Get root directory and git directory of the git repository.
+    git_root, git_dir = get_git_dirs(os.getcwd())
 
     # Set changed_headers to zero by default
     changed_headers = 0
 
+    # Get the current year once, so every file uses the same year
+    current_year = dt.today().year
+
     # Check start_year is valid
     if str(args.start_year).isdigit():
         # Check the start year is not later than the current year
-        if int(args.start_year) > dt.today().year:
+        if int(args.start_year) > current_year:
             raise Exception("Please provide a start year less than or equal to the current year.")
         # Check the start year isn't earlier than when computers were created :)
         elif int(args.start_year) < 1942:
@@ -747,24 +1272,37 @@ def main():
         raise Exception("Please ensure the start year is a number.")
 
     # Create dictionary containing the committed files, custom copyright,
-    # template, license, changed_headers, year, and git_repo
+    # template, license, changed_headers, year, git_root, and git_dir
     values = {
-        "files": get_full_paths(args.files),
+        "files": get_committed_files(args.files, git_root),
         "copyright": args.custom_copyright,
         "template": args.custom_template,
         "license": args.custom_license,
         "start_year": args.start_year,
-        "current_year": dt.today().year,
-        "git_repo": git_repo,
+        "current_year": current_year,
+        "git_root": git_root,
+        "git_dir": git_dir,
     }
 
     # Update the year in the copyright line of the LICENSE file
     license_return_code = update_license_file(values)
 
-    # Get the root of the git repository and fix the line separators
-    git_root = values["git_repo"].git.rev_parse("--show-toplevel")
+    # Fix the line separators of the root of the git repository
     os_git_root = Path(git_root).resolve()
 
+    # Skip files whose headers were up to date the last time the hook ran
+    # with the same settings and have not been modified since
+    cache_settings = get_cache_settings(values, args, os_git_root)
+    cached_files = {} if args.no_cache else load_cache(git_dir, cache_settings)
+    values["files"] = [
+        file for file in values["files"] if cached_files.get(file) != get_file_signature(file)
+    ]
+
+    # Skip building the REUSE project and linking the assets it needs
+    # when no files need to be checked
+    if not values["files"]:
+        return license_return_code
+
     # Dictionary containing the asset folder information
     assets = {
         ".reuse": {
@@ -778,17 +1316,37 @@ def main():
     }
 
     # Link the default template and/or license from the assets folder to your git repo.
-    link_assets(assets, os_git_root, args)
+    link_assets(assets, os_git_root, args, current_year)
 
-    # Create click object for the project
-    obj = common.ClickObj(git_root)
+    # Get the REUSE project of the repository
+    project = get_project(git_root)
 
     # Add or update headers of required files.
     # Return 1 if files were added or updated, and return 0 if no files were altered.
-    if len(values["files"]) <= (sys.getrecursionlimit() - 2):
-        file_return_code = recursive_file_check(changed_headers, obj, values, args, 0)
+    if (
+        not args.no_multiprocessing
+        and len(values["files"]) >= MIN_PARALLEL_FILES
+        and get_max_workers(args.jobs) > 1
+    ):
+        file_return_code, file_results = parallel_file_check(changed_headers, project, values, args)
     else:
-        file_return_code = non_recursive_file_check(changed_headers, obj, values, args)
+        file_return_code, file_results = non_recursive_file_check(
+            changed_headers, project, values, args
+        )
+
+    # Cache the files whose headers were up to date, so the hook did not change them
+    for file, file_changed in zip(values["files"], file_results):
+        if file_changed:
+            cached_files.pop(file, None)
+        else:
+            cached_files[file] = get_file_signature(file)
+
+    if not args.no_cache:
+        # Remove the files that were deleted or renamed, so the cache does not keep growing
+        cached_files = {
+            file: signature for file, signature in cached_files.items() if os.path.isfile(file)
+        }
+        save_cache(git_dir, cache_settings, cached_files)
 
     # Unlink default files & remove .reuse and LICENSES folders if empty
     cleanup(assets, os_git_root)
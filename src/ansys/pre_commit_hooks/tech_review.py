@@ -24,17 +24,17 @@ import argparse
 from datetime import date as dt
 from enum import Enum
 import filecmp
-from itertools import product
+from functools import lru_cache
 import json
+import os
 import pathlib
 import re
+import sys
 from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Optional
 
-import git
-from jinja2 import Environment, FileSystemLoader
-import requests
-import semver
-import toml
+if TYPE_CHECKING:  # pragma: no cover
+    from jinja2 import Environment
 
 HOOK_PATH = pathlib.Path(__file__).parent.resolve()
 """Location of the pre-commit hook on your system."""
@@ -57,6 +57,12 @@ DEFAULT_LICENSE = "MIT"
 JSON_URL = "https://raw.githubusercontent.com/spdx/license-list-data/main/json/licenses.json"
 """URL to retrieve list of license IDs and names."""
 
+PROJECT_NAME_REGEX = re.compile(r"^ansys-[a-z]+-[a-z]+$")
+"""Regex matching project names that follow the ansys-{product}-{library} convention."""
+
+DEV_VERSION_REGEX = re.compile(r"^[0-9]+.[0-9]+.dev[0-9]+$")
+"""Regex matching development versions, such as 0.1.dev0."""
+
 
 class Filenames(Enum):
     """Enum of files to check."""
@@ -79,6 +85,29 @@ class Directories(Enum):
     TESTS = "tests"
 
 
+def get_repo_path(path: pathlib.Path) -> pathlib.Path:
+    """
+    Get the root directory of the git repository containing a path.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path inside the git repository.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the repository's root directory.
+    """
+    path = path.resolve()
+    # Worktrees and submodules have a .git file instead of a .git directory
+    for directory in (path, *path.parents):
+        if (directory / ".git").exists():
+            return directory
+
+    raise Exception("Please run the hook inside a git repository.")
+
+
 def check_dirs_exist(repo_path: str, is_compliant: bool, directories: list) -> bool:
     """
     Check folders exist in the root of the git repository.
@@ -209,19 +238,24 @@ def check_pyproject_toml(
     str
         Name of the project from the pyproject.toml file.
     """
+    import semver
+
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:  # pragma: no cover
+        import tomli as tomllib
+
     name = ""
     # Load pyproject.toml
-    with open(repo_path / "pyproject.toml", "r") as project_file:
-        config = toml.load(project_file)
+    with open(repo_path / "pyproject.toml", "rb") as project_file:
+        config = tomllib.load(project_file)
         project = config.get("project")
 
         # Check the project name follows naming conventions: ansys-{product}-{library}
         # Ignore this check if non_compliant_name argument is True
         if not non_compliant_name:
             name = project.get("name", "DNE")
-            if (name == "DNE") or (
-                (name != "DNE") and not bool(re.match(r"^ansys-[a-z]+-[a-z]+$", name))
-            ):
+            if (name == "DNE") or not PROJECT_NAME_REGEX.match(name):
                 is_compliant = False
                 print("Project name does not follow naming conventions")
 
@@ -231,29 +265,26 @@ def check_pyproject_toml(
             try:
                 version = semver.Version.parse(project_version)
             except ValueError:
-                if not bool(re.match(r"^[0-9]+.[0-9]+.dev[0-9]+$", project_version)):
+                if not DEV_VERSION_REGEX.match(project_version):
                     is_compliant = False
                     print("Project version does not follow semantic versioning")
 
         # Check the project author and maintainer names and emails match argument input
-        category, metadata = ["authors", "maintainers"], ["name", "email"]
-        output = list(product(category, metadata))
-
-        for key, value in output:
-            # "DNE" is printed when the key does not exist
-            project_value = project.get(key, "DNE")[0].get(value, "DNE")
-            if project_value == "DNE":
-                is_compliant = False
-                # For example: "Project author name does not exist ..."
-                print(f"Project {key} {value} does not exist in the pyproject.toml file")
-            else:
-                if value == "email":
-                    is_compliant = check_auth_maint(
-                        project_value, author_maint_email, f"{key} {value}", is_compliant
-                    )
-                elif value == "name":
+        metadata = (("name", author_maint_name), ("email", author_maint_email))
+
+        for key in ("authors", "maintainers"):
+            # Get the first author or maintainer once for both the name and email checks
+            entry = (project.get(key) or [{}])[0]
+            for value, arg_value in metadata:
+                # "DNE" is printed when the key does not exist
+                project_value = entry.get(value, "DNE")
+                if project_value == "DNE":
+                    is_compliant = False
+                    # For example: "Project author name does not exist ..."
+                    print(f"Project {key} {value} does not exist in the pyproject.toml file")
+                else:
                     is_compliant = check_auth_maint(
-                        project_value, author_maint_name, f"{key} {value}", is_compliant
+                        project_value, arg_value, f"{key} {value}", is_compliant
                     )
 
     return is_compliant, name
@@ -345,16 +376,15 @@ def download_license_json(url: str, json_file: str) -> bool:
     """
     # If the licenses.json file does not exist in the hook's folder
     if not pathlib.Path.exists(json_file):
+        import requests
+
         # Download licenses.json
         r = requests.get(url, timeout=60)
         status_code = r.status_code
         if status_code == 200:
-            # If it was successfully downloaded, write content to file
-            with open(json_file, "w", encoding="utf-8") as f:
-                f.write(r.text)
-
-            # Restructure json file to use "licenseID: name"
-            restructure_json(json_file)
+            # If it was successfully downloaded, write the content to the file
+            # using "licenseID: name" without writing the full download first
+            restructure_json(json_file, r.json())
         else:
             print("There was a problem downloading license.json. Skipping LICENSE content check")
             return False
@@ -362,7 +392,7 @@ def download_license_json(url: str, json_file: str) -> bool:
     return True
 
 
-def restructure_json(file: str):
+def restructure_json(file: str, existing_json: Optional[dict] = None):
     """
     Remove extra information from licenses.json file.
 
@@ -370,18 +400,21 @@ def restructure_json(file: str):
     ----------
     file: str
         The path of the json_file to be updated.
+    existing_json: dict, default: None
+        The content of the licenses.json file. If ``None``, it is read from ``file``.
     """
     licenseid_name_dict = {}
 
     # Open the licenses.json file
-    with open(file, "r", encoding="utf-8") as json_file:
-        existing_json = json.load(json_file)
+    if existing_json is None:
+        with open(file, "r", encoding="utf-8") as json_file:
+            existing_json = json.load(json_file)
 
-        for license in existing_json["licenses"]:
-            # If the license is not deprecated, add it to the dictionary
-            if not license["isDeprecatedLicenseId"]:
-                # { "MIT": "MIT License", ... }
-                licenseid_name_dict[license["licenseId"]] = license["name"]
+    for license in existing_json["licenses"]:
+        # If the license is not deprecated, add it to the dictionary
+        if not license["isDeprecatedLicenseId"]:
+            # { "MIT": "MIT License", ... }
+            licenseid_name_dict[license["licenseId"]] = license["name"]
 
     # Overwrite json file with the dictionary
     with open(file, "w") as json_file:
@@ -448,6 +481,12 @@ def check_file_exists(
         "README.md": "the-readme-file",
     }
 
+    # List the root and .github directories once instead of checking each file separately
+    dir_entries = {
+        repo_path: get_dir_entries(repo_path),
+        repo_path / ".github": get_dir_entries(repo_path / ".github"),
+    }
+
     # Check if each file exists. If not, generate the file from the template.
     # Check the content of the LICENSE and CONTRIBUTORS.md files as well
     for file in files:
@@ -455,7 +494,7 @@ def check_file_exists(
             repo_file_path = repo_path / ".github" / file
         else:
             if "README" in file:
-                if pathlib.Path.exists(repo_path / f"{file}.md"):
+                if path_exists(repo_path / f"{file}.md", dir_entries):
                     file = f"{file}.md"
                 else:
                     file = f"{file}.rst"
@@ -469,11 +508,11 @@ def check_file_exists(
         )
 
         if "AUTHORS" in file:
-            if pathlib.Path.exists(repo_path / f"{file}.md"):
+            if path_exists(repo_path / f"{file}.md", dir_entries):
                 repo_file_path = repo_path / f"{file}.md"
 
         # If the path does not exist
-        if not pathlib.Path.exists(repo_file_path):
+        if not path_exists(repo_file_path, dir_entries):
             is_compliant = False
             dne_message = f"{file} does not exist. Creating file from template..."
             if "setuptools" in config_file:
@@ -509,6 +548,72 @@ def check_file_exists(
     return is_compliant
 
 
+def get_dir_entries(directory: pathlib.Path) -> set:
+    """
+    Get the names of the entries in a directory.
+
+    Parameters
+    ----------
+    directory: pathlib.Path
+        Path of the directory to list.
+
+    Returns
+    -------
+    set
+        Names of the files and directories in the directory. The set is empty
+        if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def path_exists(path: pathlib.Path, dir_entries: dict) -> bool:
+    """
+    Check if a path exists using the listed entries of its parent directory.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path of the file to check.
+    dir_entries: dict
+        Dictionary mapping directories to the names of their entries.
+
+    Returns
+    -------
+    bool
+        ``True`` if the path exists.
+        ``False`` if the path does not exist.
+    """
+    if path.name in dir_entries.get(path.parent, ()):
+        return True
+
+    # Names are compared exactly, so ask the file system in case it ignores case
+    return path.exists()
+
+
+@lru_cache(maxsize=1)
+def get_jinja_env() -> "Environment":
+    """
+    Get the jinja environment that loads the templates from the hook path.
+
+    The environment is only created once, so its template cache is shared by all files.
+
+    Returns
+    -------
+    jinja2.Environment
+        Environment loading the hook's templates.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    # Load the templates from the hook path
+    loader = FileSystemLoader(searchpath=pathlib.PurePath.joinpath(HOOK_PATH, "templates"))
+    # The templates do not change while the hook runs, so do not check them for updates
+    return Environment(loader=loader, auto_reload=False)  # nosec
+
+
 def generate_file_from_jinja(
     file: str,
     project_name: str,
@@ -543,11 +648,8 @@ def generate_file_from_jinja(
     str
         Content of the template that was generated.
     """
-    # Load the templates from the hook path
-    loader = FileSystemLoader(searchpath=pathlib.PurePath.joinpath(HOOK_PATH, "templates"))
-    env = Environment(loader=loader)  # nosec
     # Get the template for the specified file
-    template = env.get_template(file)
+    template = get_jinja_env().get_template(file)
     # Generate the file content from the template
     file_content = template.render(
         doc_repo_name=doc_repo_name,  # pymechanical
@@ -692,15 +794,17 @@ def main():
     # `False` when a file is missing or its content is incorrect
     is_compliant = True
 
-    # Get current git repository
-    git_repo = git.Repo(pathlib.Path.cwd(), search_parent_directories=True)
-    repo_path = pathlib.Path(git_repo.git.rev_parse("--show-toplevel"))
+    # GitPython is slow to import, so only load it once the arguments have been parsed
+    import git
+
+    # Get the root of the current git repository without starting a git process
+    repo_path = get_repo_path(pathlib.Path.cwd())
 
-    # Get dates of commits from earliest to most recent
-    g = git.Git(pathlib.Path.cwd())
-    all_dates = g.log("--reverse", r"--format=%ci")
-    # Get year of first commit
-    start_year = int(all_dates[0:4])
+    # Get dates of the root commits. Listing only the root commits keeps git
+    # from formatting the whole history for a single date
+    root_dates = git.Git(repo_path).log("--max-parents=0", r"--format=%ci")
+    # Get year of first commit, which git lists after any other root commits
+    start_year = int(root_dates.splitlines()[-1][0:4])
 
     # Get a list of directories to check
     directories = [directory.value for directory in Directories]
@@ -801,3 +801,335 @@ def test_line_endings(tmp_path: pytest.TempPathFactory):
     assert license_line_endings_before == get_line_endings(tmp_license)
 
     os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_unstaged_entries_ignored(tmp_path: pytest.TempPathFactory):
+    """Test directories and files that do not exist are not annotated."""
+    # Set template and license names
+    template_name = "ansys.jinja2"
+    license_name = "MIT.txt"
+    template_path = Path(REPO_PATH) / ".reuse" / "templates" / template_name
+    license_path = Path(REPO_PATH) / "LICENSES" / license_name
+
+    # Set up git repository in tmp_path with temporary file
+    repo, tmp_file = set_up_repo(tmp_path, template_path, template_name, license_path, license_name)
+    os.makedirs(Path(tmp_path) / "subdir")
+    custom_args = [tmp_file, "subdir", "does_not_exist.py"]
+
+    # Assert the hook fails because it added the header to the staged file only
+    assert add_argv_run(repo, tmp_file, custom_args) == 1
+
+    check_ansys_header(tmp_file)
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_changed_files_env(tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    """Test the environment variable narrows down the committed files."""
+    # Set template and license names
+    template_name = "ansys.jinja2"
+    license_name = "MIT.txt"
+    template_path = Path(REPO_PATH) / ".reuse" / "templates" / template_name
+    license_path = Path(REPO_PATH) / "LICENSES" / license_name
+
+    # Set up git repository in tmp_path with temporary file
+    repo, tmp_file = set_up_repo(tmp_path, template_path, template_name, license_path, license_name)
+    other_file = create_test_file(tmp_path)
+    readme = Path(tmp_path) / "README.md"
+    readme.write_text("# Readme\n", encoding="utf8")
+
+    # Deleted files and files that were not passed to the hook are ignored
+    monkeypatch.setenv(hook.FILES_ENV_VARIABLE, "\n".join([tmp_file, "removed.py", str(readme)]))
+
+    # Assert the hook fails because it added the header to the listed file only
+    assert add_argv_run(repo, tmp_file, [tmp_file, other_file]) == 1
+
+    check_ansys_header(tmp_file)
+    assert Path(other_file).read_text(encoding="utf8") == "# test message\n"
+    assert readme.read_text(encoding="utf8") == "# Readme\n"
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_get_committed_files(tmp_path: pytest.TempPathFactory):
+    """Test missing entries are dropped and directories are replaced by their staged files."""
+    repo = init_repo(tmp_path)
+    os.chdir(tmp_path)
+
+    # Commit a file, so it is not staged when the hook runs
+    committed_file = create_test_file(tmp_path)
+    repo.index.add(committed_file)
+    repo.index.commit("add committed file")
+
+    # Stage one file in a subdirectory and leave the other one untracked
+    sub_dir = Path(tmp_path) / "sub"
+    sub_dir.mkdir()
+    staged_file = create_test_file(sub_dir)
+    repo.index.add(staged_file)
+    create_test_file(sub_dir)
+
+    assert hook.get_committed_files(
+        [committed_file, "removed.py", "sub"], repo.working_tree_dir
+    ) == [os.path.abspath(committed_file), os.path.abspath(staged_file)]
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_multiprocessing(tmp_path: pytest.TempPathFactory, capsys):
+    """Test license headers are added when the files are checked in parallel processes."""
+    # List of files to be git added
+    new_files = []
+
+    # Set template and license names
+    template_name = "ansys.jinja2"
+    license_name = "MIT.txt"
+    template_path = Path(REPO_PATH) / ".reuse" / "templates" / template_name
+    license_path = Path(REPO_PATH) / "LICENSES" / license_name
+
+    # Set up git repository in tmp_path with temporary file
+    repo, tmp_file = set_up_repo(tmp_path, template_path, template_name, license_path, license_name)
+    new_files.append(tmp_file)
+
+    # Create enough files to check them in parallel
+    for i in range(0, hook.MIN_PARALLEL_FILES):
+        new_files.append(create_test_file(tmp_path))
+
+    # Check files in two processes even if the machine has a single CPU
+    custom_args = ["--jobs=2", *new_files]
+
+    capsys.readouterr()
+    assert add_argv_run(repo, new_files, custom_args) == 1
+
+    # Assert the messages of the workers are printed on separate lines in file order
+    output = capsys.readouterr().out.splitlines()
+    assert [line for line in output if line.startswith("Successfully changed header")] == [
+        f"Successfully changed header of {file}" for file in new_files
+    ]
+
+    for file in new_files:
+        check_ansys_header(file)
+
+    # Assert the headers are up to date when checked in parallel again
+    assert add_argv_run(repo, new_files, custom_args) == 0
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_invalid_jobs():
+    """Test a number of jobs lower than one is rejected."""
+    for jobs in ("0", "-1", "two"):
+        sys.argv[1:] = [f"--jobs={jobs}"]
+        with pytest.raises(SystemExit):
+            hook.set_lint_args(argparse.ArgumentParser())
+
+
+@pytest.mark.add_license_headers
+def test_windows_max_workers(monkeypatch: pytest.MonkeyPatch):
+    """Test the number of processes is limited to what Windows supports."""
+    monkeypatch.setattr(hook.sys, "platform", "win32")
+    monkeypatch.setattr(hook.os, "cpu_count", lambda: 64)
+
+    assert hook.get_max_workers(None) == hook.WINDOWS_MAX_WORKERS
+    assert hook.get_max_workers(64) == hook.WINDOWS_MAX_WORKERS
+    assert hook.get_max_workers(4) == 4
+
+
+@pytest.mark.add_license_headers
+def test_multiprocessing_default_jobs(
+    tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+):
+    """Test the default number of processes is limited on Windows when many files are checked."""
+    # Set template and license names
+    template_name = "ansys.jinja2"
+    license_name = "MIT.txt"
+    template_path = Path(REPO_PATH) / ".reuse" / "templates" / template_name
+    license_path = Path(REPO_PATH) / "LICENSES" / license_name
+
+    # Set up git repository in tmp_path with more files than Windows supports processes
+    repo, tmp_file = set_up_repo(tmp_path, template_path, template_name, license_path, license_name)
+    new_files = [tmp_file]
+    for i in range(0, hook.WINDOWS_MAX_WORKERS):
+        new_files.append(create_test_file(tmp_path))
+
+    # Record the number of processes requested, but only start two of them
+    requested_workers = []
+
+    class RecordingExecutor(hook.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            requested_workers.append(max_workers)
+            super().__init__(max_workers=2, **kwargs)
+
+    # Only the hook sees the Windows platform, so git and multiprocessing still work
+    class WindowsSys:
+        platform = "win32"
+
+        def __getattr__(self, name):
+            return getattr(sys, name)
+
+    monkeypatch.setattr(hook, "ProcessPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(hook, "sys", WindowsSys())
+    monkeypatch.setattr(hook.os, "cpu_count", lambda: 64)
+
+    assert add_argv_run(repo, new_files, new_files) == 1
+    assert requested_workers == [hook.WINDOWS_MAX_WORKERS]
+
+    for file in new_files:
+        check_ansys_header(file)
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_cache(tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    """Test files with up to date headers are cached and rechecked after modification."""
+    # Set template and license names
+    template_name = "ansys.jinja2"
+    license_name = "MIT.txt"
+    template_path = Path(REPO_PATH) / ".reuse" / "templates" / template_name
+    license_path = Path(REPO_PATH) / "LICENSES" / license_name
+
+    # Set up git repository in tmp_path with temporary file
+    repo, tmp_file = set_up_repo(tmp_path, template_path, template_name, license_path, license_name)
+
+    # Assert the hook fails because it added the header to the file
+    assert add_argv_run(repo, tmp_file, [tmp_file]) == 1
+
+    # Assert the file is cached after its header was found up to date
+    assert add_argv_run(repo, tmp_file, [tmp_file]) == 0
+    cache_file = Path(repo.git_dir) / hook.CACHE_FILE
+    assert str(Path(tmp_file).resolve()) in cache_file.read_text(encoding="utf-8")
+
+    # Assert the REUSE project is not built when all files are cached
+    with monkeypatch.context() as patch:
+        patch.setattr(hook, "get_project", lambda git_root: pytest.fail())
+        assert add_argv_run(repo, tmp_file, [tmp_file]) == 0
+
+    # Assert the cached file is checked again with --no_cache
+    with monkeypatch.context() as patch:
+        checked_files = []
+        patch.setattr(hook, "check_file", lambda file, *args: checked_files.append(file) or 0)
+        assert add_argv_run(repo, tmp_file, ["--no_cache", tmp_file]) == 0
+        assert checked_files == [os.path.abspath(tmp_file)]
+
+    # Cache another file and delete it
+    other_file = create_test_file(tmp_path)
+    assert add_argv_run(repo, other_file, [other_file]) == 1
+    assert add_argv_run(repo, other_file, [other_file]) == 0
+    repo.index.remove(other_file)
+    os.remove(other_file)
+
+    # Remove the header and assert the modified file is checked again
+    with open(tmp_file, "w", encoding="utf8") as file:
+        file.write("print('cache')\n")
+
+    assert add_argv_run(repo, tmp_file, [tmp_file]) == 1
+
+    check_ansys_header(tmp_file)
+
+    # Assert the deleted file was removed from the cache
+    assert str(Path(other_file).resolve()) not in cache_file.read_text(encoding="utf-8")
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_cache_settings(tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    """Test changing the default template in the hook's assets invalidates the cache."""
+    # Use a copy of the hook's assets, so the default template can be modified
+    assets_path = Path(tmp_path) / "assets"
+    shutil.copytree(hook.ASSETS_PATH, assets_path)
+    monkeypatch.setattr(hook, "ASSETS_PATH", assets_path)
+
+    values = {
+        "copyright": DEFAULT_COPYRIGHT,
+        "template": hook.DEFAULT_TEMPLATE,
+        "license": hook.DEFAULT_LICENSE,
+        "start_year": START_YEAR,
+        "current_year": dt.today().year,
+    }
+    args = argparse.Namespace(ignore_license_check=False)
+    settings = hook.get_cache_settings(values, args, tmp_path)
+
+    # Change the modification time of the default template
+    template_file = assets_path / ".reuse" / "templates" / f"{hook.DEFAULT_TEMPLATE}.jinja2"
+    mtime_ns = os.stat(template_file).st_mtime_ns + 1_000_000_000
+    os.utime(template_file, ns=(mtime_ns, mtime_ns))
+
+    assert hook.get_cache_settings(values, args, tmp_path) != settings
+
+
+@pytest.mark.add_license_headers
+def test_get_project(tmp_path: pytest.TempPathFactory):
+    """Test the project finds nested REUSE.toml files like REUSE does."""
+    from reuse.project import Project
+
+    repo = init_repo(tmp_path)
+
+    # Create a REUSE.toml file in the root and in a subdirectory
+    sub_dir = Path(tmp_path) / "sub"
+    sub_dir.mkdir()
+    for directory, name in ((Path(tmp_path), "Root"), (sub_dir, "Sub")):
+        (directory / "REUSE.toml").write_text(
+            "version = 1\n\n[[annotations]]\n"
+            f'path = "*.txt"\nSPDX-FileCopyrightText = "{name}"\nSPDX-License-Identifier = "MIT"\n',
+            encoding="utf8",
+        )
+        (directory / "file.txt").write_text("text\n", encoding="utf8")
+
+    # REUSE skips empty REUSE.toml files
+    empty_dir = Path(tmp_path) / "empty"
+    empty_dir.mkdir()
+    (empty_dir / "REUSE.toml").touch()
+    (empty_dir / "file.txt").write_text("text\n", encoding="utf8")
+
+    expected = Project.from_directory(repo.working_tree_dir)
+    project = hook.get_project(repo.working_tree_dir)
+
+    for file in (Path(tmp_path) / "file.txt", sub_dir / "file.txt", empty_dir / "file.txt"):
+        assert project.reuse_info_of(file) == expected.reuse_info_of(file)
+
+    # Assert a REUSE.toml file that cannot be parsed raises a readable error
+    (empty_dir / "REUSE.toml").write_text("version = 1\n[[annotations]\n", encoding="utf8")
+    with pytest.raises(Exception, match="could not be parsed"):
+        hook.get_project(repo.working_tree_dir)
+
+
+@pytest.mark.add_license_headers
+def test_duplicate_files(tmp_path: pytest.TempPathFactory):
+    """Test files passed more than once are only checked once."""
+    repo = init_repo(tmp_path)
+    os.chdir(tmp_path)
+
+    tmp_file = create_test_file(tmp_path)
+    repo.index.add(tmp_file)
+
+    assert hook.get_committed_files([tmp_file, tmp_file], repo.working_tree_dir) == [
+        os.path.abspath(tmp_file)
+    ]
+
+    os.chdir(REPO_PATH)
+
+
+@pytest.mark.add_license_headers
+def test_get_git_dirs(tmp_path: pytest.TempPathFactory):
+    """Test the repository root and git directory are found from a subdirectory and worktree."""
+    repo = init_repo(tmp_path / "repo")
+    sub_dir = Path(repo.working_tree_dir) / "sub"
+    sub_dir.mkdir()
+
+    assert hook.get_git_dirs(sub_dir) == (repo.working_tree_dir, os.path.normpath(repo.git_dir))
+
+    # Worktrees have a .git file pointing to their git directory
+    worktree = tmp_path / "worktree"
+    repo.git.worktree("add", str(worktree))
+    worktree_repo = git.Repo(worktree)
+
+    assert hook.get_git_dirs(worktree) == (
+        worktree_repo.working_tree_dir,
+        os.path.normpath(worktree_repo.git_dir),
+    )
@@ -430,6 +430,21 @@ def check_generated_files(tmp_path, file_list, config_file):
         assert check_same_content(correct_file, created_file) == True
 
 
+@pytest.mark.tech_review
+def test_get_repo_path(tmp_path: pytest.TempPathFactory):
+    """Test the repository root is found from a subdirectory."""
+    tmp_path = tmp_path / "pytechreview"
+    setup_repo(tmp_path)
+
+    assert hook.get_repo_path(tmp_path / "src") == tmp_path.resolve()
+
+    # A directory outside of a repository raises an exception
+    with pytest.raises(Exception, match="inside a git repository"):
+        hook.get_repo_path(pathlib.Path(tmp_path.anchor))
+
+    os.chdir(REPO_PATH)
+
+
 @pytest.mark.tech_review
 def test_json_download_n_update(tmp_path: pytest.TempPathFactory):
     """Test the licenses.json file is downloaded and updated."""
@@ -456,6 +471,24 @@ def test_json_download_n_update(tmp_path: pytest.TempPathFactory):
     os.chdir(REPO_PATH)
 
 
+@pytest.mark.tech_review
+def test_restructure_json(tmp_path: pytest.TempPathFactory):
+    """Test the downloaded licenses are restructured without writing them first."""
+    license_json = tmp_path / "license.json"
+    downloaded_json = {
+        "licenses": [
+            {"licenseId": "MIT", "name": "MIT License", "isDeprecatedLicenseId": False},
+            {"licenseId": "GPL-2.0", "name": "GNU GPL v2.0 only", "isDeprecatedLicenseId": True},
+        ]
+    }
+
+    hook.restructure_json(license_json, downloaded_json)
+
+    # Check only the license that is not deprecated was written
+    with open(license_json, "r") as license:
+        assert json.load(license) == {"MIT": "MIT License"}
+
+
 @pytest.mark.tech_review
 def test_main():
     """Test main for the ansys/pre-commit-hooks repository."""